@@ -26,31 +26,88 @@
 # implied. See the License for the specific language governing permissions and limitations under the
 # License.
 #
+import math
+from functools import lru_cache
 import numpy as np
-from .generators import *
 
-__all__ = ['norris', 'tophat', 'constant', 'linear', 'quadratic']
+__all__ = ['norris', 'norris_batch', 'tophat', 'constant', 'linear', 'quadratic',
+           'evaluate_model']
 
 # pulse shapes
-def tophat(x, amp, tstart, tstop):
+def tophat(x, amp, tstart, tstop, assume_sorted=False, out=None):
     """A tophat (rectangular) pulse function.
     
     Args:
-        x (np.array): Array of times
+        x (float or np.array): Time or array of times
         amp (float): The tophat amplitude
         tstart (float): The start time of the tophat
         tstop (float): The end time of the tophat
+        assume_sorted (bool, optional): If True, ``x`` must be 
+                                        monotonically increasing, and only 
+                                        the samples within the tophat are 
+                                        touched. Unordered or NaN times give 
+                                        incorrect results. Ignored for 
+                                        multidimensional times. Default is 
+                                        False.
+        out (np.array, optional): An array with the same shape as ``x`` in 
+                                  which to store the result
     
     Returns:
-        (np.array)
+        (float or np.array)
+    """
+    if np.isscalar(x):
+        return float(amp) if tstart <= x <= tstop else 0.0
+    
+    x = np.asarray(x, dtype=np.float64)
+    if assume_sorted and x.ndim == 1:
+        i0 = np.searchsorted(x, tstart, side='left')
+        i1 = np.searchsorted(x, tstop, side='right')
+        fxn = np.empty_like(x) if out is None else out
+        fxn[:i0] = 0.0
+        fxn[i0:i1] = amp
+        fxn[i1:] = 0.0
+    else:
+        fxn = np.multiply((x >= tstart) & (x <= tstop), float(amp), out=out)
+    return fxn
+
+
+@lru_cache(maxsize=256)
+def _cached_norris_lam(t_rise, t_decay):
+    return math.exp(2.0 * math.sqrt(t_rise / t_decay))
+
+
+def _norris_lam(t_rise, t_decay):
+    """The Norris pulse normalization, cached since simulations typically 
+    evaluate many pulses with the same rise and decay times. A zero decay 
+    time raises ZeroDivisionError, as in the original implementation. Arrays 
+    of parameters, and values that overflow or are out of the domain of the 
+    math functions, fall back to numpy, which returns inf/nan with a warning.
+    """
+    if np.ndim(t_rise) == 0 and np.ndim(t_decay) == 0:
+        if t_decay == 0.0:
+            raise ZeroDivisionError('t_decay must be non-zero')
+        try:
+            return _cached_norris_lam(float(t_rise), float(t_decay))
+        except (OverflowError, ValueError):
+            pass
+    return np.exp(2.0 * np.sqrt(np.divide(t_rise, t_decay)))
+
+
+def _norris_active(dt, amp, t_rise, t_decay, out=None):
+    """Evaluate the Norris pulse over times since the pulse start, ``dt``, 
+    which must all be positive. The exponent is evaluated in a single work 
+    buffer to avoid temporaries, and ``dt`` is overwritten.
     """
-    mask = (x >= tstart) & (x <= tstop)
-    fxn = np.zeros_like(x)
-    fxn[mask] = amp
+    lam = amp * _norris_lam(t_rise, t_decay)
+    fxn = np.divide(-t_rise, dt, out=out)
+    dt *= np.divide(1.0, t_decay)
+    fxn -= dt
+    np.exp(fxn, out=fxn)
+    fxn *= lam
     return fxn
 
 
-def norris(x, amp, tstart, t_rise, t_decay):
+def norris(x, amp, tstart, t_rise, t_decay, assume_sorted=False, out=None):
     r"""A Norris pulse-shape function:
 
     :math:`I(t) = A \lambda e^{-\tau_1/t - t/\tau_2} \text{ for } t > 0;\\ 
@@ -67,58 +124,128 @@ def norris(x, amp, tstart, t_rise, t_decay):
         <https://iopscience.iop.org/article/10.1086/430294>`_
     
     Args:
-        x (np.array): Array of times
+        x (float or np.array): Time or array of times
         amp (float): The amplitude of the pulse
         tstart (float): The start time of the pulse
         t_rise (float): The rise timescal of the pulse
         t_decay (flaot): The decay timescale of the pulse
+        assume_sorted (bool, optional): If True, ``x`` must be 
+                                        monotonically increasing, and only 
+                                        the samples after the pulse start are 
+                                        evaluated. Unordered or NaN times give 
+                                        incorrect results. Ignored for 
+                                        multidimensional times. Default is 
+                                        False.
+        out (np.array, optional): An array with the same shape as ``x`` in 
+                                  which to store the result
     
     Returns:
-        (np.array)
+        (float or np.array)
+    """
+    if np.isscalar(x):
+        lam = amp * _norris_lam(t_rise, t_decay)
+        if x <= tstart:
+            return 0.0
+        dt = x - tstart
+        try:
+            return lam * math.exp(-t_rise / dt - dt / t_decay)
+        except (OverflowError, ValueError):
+            # let numpy return inf/nan with a warning, as for arrays
+            return float(norris(np.array(x), amp, tstart, t_rise, t_decay))
+    
+    x = np.asarray(x, dtype=np.float64)
+    fxn = np.empty_like(x) if out is None else out
+    if assume_sorted and x.ndim == 1:
+        i0 = np.searchsorted(x, tstart, side='right')
+        fxn[:i0] = 0.0
+        _norris_active(x[i0:] - tstart, amp, t_rise, t_decay, out=fxn[i0:])
+    else:
+        mask = (x > tstart)
+        fxn[~mask] = 0.0
+        fxn[mask] = _norris_active(x[mask] - tstart, amp, t_rise, t_decay)
+    return fxn
+
+
+def norris_batch(x, amp, tstart, t_rise, t_decay):
+    """Evaluate a set of Norris pulses over the same array of times.
+    
+    This is equivalent to calling :func:`norris` once per parameter set, but 
+    all pulses are evaluated together in a single vectorized operation.
+    
+    Args:
+        x (np.array): Array of times
+        amp (np.array): The amplitudes of the pulses
+        tstart (np.array): The start times of the pulses
+        t_rise (np.array): The rise timescales of the pulses
+        t_decay (np.array): The decay timescales of the pulses
+    
+    Returns:
+        (np.array): An array of shape (``npulses``,) + ``x.shape``, where 
+                    each entry along the first axis is one pulse evaluated 
+                    over ``x``
     """
-    x = np.asarray(x)
-    fxn = np.zeros_like(x)
-    mask = (x > tstart)
-    lam = amp * np.exp(2.0 * np.sqrt(t_rise / t_decay))
-    fxn[mask] = lam * np.exp(
-        -t_rise / (x[mask] - tstart) - (x[mask] - tstart) / t_decay)
+    x = np.asarray(x, dtype=np.float64)
+    shape = (-1,) + (1,) * x.ndim
+    amp, tstart, t_rise, t_decay = [np.asarray(param, dtype=np.float64).reshape(shape)
+                                    for param in (amp, tstart, t_rise, t_decay)]
+    
+    # times not after the pulse start are pushed to infinity to keep the 
+    # kernel finite, and their values are then zeroed
+    dt = x - tstart
+    inactive = ~(dt > 0.0)
+    dt[inactive] = np.inf
+    fxn = _norris_active(dt, amp, t_rise, t_decay)
+    fxn[inactive] = 0.0
     return fxn
 
 
 # ------------------------------------------------------------------------------
 
 # background profiles
-def constant(x, amp):
+def constant(x, amp, out=None):
     """A constant background function.
     
     Args:
-        x (np.array): Array of times
+        x (float or np.array): Time or array of times
         amp (float): The background amplitude
+        out (np.array, optional): An array with the same shape as ``x`` in 
+                                  which to store the result
     
     Returns:
-        (np.array)
+        (float or np.array): For an array of times and no ``out``, a 
+                             read-only view broadcast to the shape of ``x``. 
+                             Use ``copy()`` or ``out`` if a writeable array 
+                             is needed.
     """
-    fxn = np.empty(x.size)
-    fxn.fill(amp)
+    if np.isscalar(x):
+        return float(amp)
+    
+    if out is not None:
+        out[...] = amp
+        return out
+    fxn = np.broadcast_to(np.float64(amp), np.shape(x))
     return fxn
 
 
-def linear(x, c0, c1):
+def linear(x, c0, c1, out=None):
     """A linear background function.
     
     Args:
         x (np.array): Array of times
         c0 (float): The constant coefficient
         c1 (float): The linear coefficient
+        out (np.array, optional): An array with the same shape as ``x`` in 
+                                  which to store the result
     
     Returns:
         (np.array)
     """
-    fxn = c0 + c1 * x
+    fxn = np.multiply(x, c1, out=out, dtype=np.float64)
+    fxn += c0
     return fxn
 
 
-def quadratic(x, c0, c1, c2):
+def quadratic(x, c0, c1, c2, out=None):
     """A quadratic background function.
     
     Args:
@@ -126,9 +253,80 @@ def quadratic(x, c0, c1, c2):
         c0 (float): The constant coefficient
         c1 (float): The linear coefficient
         c2 (float): The quadratic coefficient
+        out (np.array, optional): An array with the same shape as ``x`` in 
+                                  which to store the result
+    
+    Returns:
+        (np.array)
+    """
+    # Horner's form reads x after the first step, so evaluate in a scratch 
+    # buffer if the output overlaps the input
+    if out is not None and np.shares_memory(x, out):
+        out[...] = quadratic(x, c0, c1, c2)
+        return out
+    
+    # Horner's form, c0 + x * (c1 + x * c2), evaluated in a single buffer
+    fxn = np.multiply(x, c2, out=out, dtype=np.float64)
+    fxn += c1
+    fxn *= x
+    fxn += c0
+    return fxn
+
+
+# ------------------------------------------------------------------------------
+
+# composite models
+def evaluate_model(x, bkgd_params, pulse_params, assume_sorted=False, 
+                   out=None):
+    """Evaluate a quadratic background plus any number of Norris pulses.
+    
+    The result is equivalent to summing :func:`quadratic` and :func:`norris` 
+    for each pulse, but every component is accumulated into a single output 
+    array using scratch buffers that are shared by all pulses.  With 
+    ``assume_sorted``, each pulse only touches the samples after its start 
+    time.
+    
+    Args:
+        x (np.array): Array of times
+        bkgd_params (tuple): The (c0, c1, c2) coefficients of the background.
+                             Use zeros for the unused higher-order terms.
+        pulse_params (list of tuple): The (amp, tstart, t_rise, t_decay) 
+                                      parameters of each Norris pulse
+        assume_sorted (bool, optional): If True, ``x`` must be 
+                                        monotonically increasing. Unordered 
+                                        or NaN times give incorrect results. 
+                                        Ignored for multidimensional times. 
+                                        Default is False.
+        out (np.array, optional): An array with the same shape as ``x`` in 
+                                  which to store the result
     
     Returns:
         (np.array)
     """
-    fxn = linear(x, c0, c1) + c2 * x ** 2
+    x = np.asarray(x, dtype=np.float64)
+    if out is not None and np.shares_memory(x, out):
+        x = x.copy()
+    fxn = quadratic(x, *bkgd_params, out=out)
+    
+    # scratch buffers shared by all pulses
+    dt = np.empty_like(x)
+    pulse = np.empty_like(x)
+    if assume_sorted and x.ndim == 1:
+        for amp, tstart, t_rise, t_decay in pulse_params:
+            i0 = np.searchsorted(x, tstart, side='right')
+            np.subtract(x[i0:], tstart, out=dt[i0:])
+            _norris_active(dt[i0:], amp, t_rise, t_decay, out=pulse[i0:])
+            fxn[i0:] += pulse[i0:]
+    else:
+        inactive = np.empty(x.shape, dtype=bool)
+        for amp, tstart, t_rise, t_decay in pulse_params:
+            # times not after the pulse start are pushed to infinity to keep 
+            # the kernel finite, and their contribution is then zeroed
+            np.subtract(x, tstart, out=dt)
+            np.greater(dt, 0.0, out=inactive)
+            np.logical_not(inactive, out=inactive)
+            np.copyto(dt, np.inf, where=inactive)
+            _norris_active(dt, amp, t_rise, t_decay, out=pulse)
+            np.copyto(pulse, 0.0, where=inactive)
+            fxn += pulse
     return fxn
@@ -37,6 +37,30 @@ class TestTophat(TestCase):
         params = (1.0, 0.0, 20.0)
         y = tophat(times, *params)
         self.assertCountEqual(y, np.array([0.0, 1.0, 1.0]))
+    
+    def test_tophat_scalar(self):
+        params = (1.0, 0.0, 20.0)
+        self.assertEqual(tophat(-10.0, *params), 0.0)
+        self.assertEqual(tophat(10.0, *params), 1.0)
+    
+    def test_tophat_unsorted(self):
+        params = (1.0, 0.0, 20.0)
+        y = tophat(times[::-1], *params)
+        np.testing.assert_array_equal(y, np.array([1.0, 1.0, 0.0]))
+    
+    def test_tophat_assume_sorted(self):
+        params = (1.0, 0.0, 20.0)
+        y = tophat(times, *params, assume_sorted=True)
+        np.testing.assert_array_equal(y, np.array([0.0, 1.0, 1.0]))
+    
+    def test_tophat_int(self):
+        y = tophat([-1, 0, 1], 2, 0, 0)
+        np.testing.assert_array_equal(y, np.array([0.0, 2.0, 0.0]))
+    
+    def test_tophat_2d(self):
+        params = (1.0, 0.0, 20.0)
+        y = tophat(times.reshape(3, 1), *params)
+        np.testing.assert_array_equal(y, np.array([[0.0], [1.0], [1.0]]))
 
 
 class TestNorris(TestCase):
@@ -45,6 +69,80 @@ class TestNorris(TestCase):
         y = norris(times, *params)
         true = np.array((0.0, 0.858, 0.006))
         [self.assertAlmostEqual(y[i], true[i], places=3) for i in range(3)]
+    
+    def test_norris_scalar(self):
+        params = (1.0, -1.0, 0.1, 2.0)
+        y = [norris(t, *params) for t in times]
+        true = norris(times, *params)
+        [self.assertAlmostEqual(y[i], true[i]) for i in range(3)]
+    
+    def test_norris_unsorted(self):
+        params = (1.0, -1.0, 0.1, 2.0)
+        y = norris(times[::-1], *params)
+        true = np.array((0.006, 0.858, 0.0))
+        np.testing.assert_allclose(y, true, atol=1e-3)
+    
+    def test_norris_assume_sorted(self):
+        params = (1.0, -1.0, 0.1, 2.0)
+        y = norris(times, *params, assume_sorted=True)
+        np.testing.assert_allclose(y, norris(times, *params))
+    
+    def test_norris_int(self):
+        y = norris([-1, 0, 1], 1, 0, 1, 1)
+        np.testing.assert_allclose(y, np.array([0.0, 0.0, 1.0]))
+    
+    def test_norris_0d(self):
+        params = (1.0, -1.0, 0.1, 2.0)
+        y = norris(np.array(0.0), *params)
+        self.assertEqual(y.shape, ())
+        self.assertAlmostEqual(float(y), norris(0.0, *params))
+    
+    def test_norris_0d_params(self):
+        params = (1.0, -1.0, 0.1, 2.0)
+        y = norris(times, *[np.array(param) for param in params])
+        np.testing.assert_allclose(y, norris(times, *params))
+    
+    def test_norris_overflow(self):
+        with np.errstate(over='ignore', invalid='ignore'):
+            y = norris(times, 1.0, -1.0, 1e3, 1e-3)
+        self.assertEqual(y[0], 0.0)
+        self.assertTrue(np.isnan(y[1:]).all())
+    
+    def test_norris_zero_decay(self):
+        with self.assertRaises(ZeroDivisionError):
+            norris(times, 1.0, -1.0, 0.1, 0.0)
+        with self.assertRaises(ZeroDivisionError):
+            norris(10.0, 1.0, -1.0, 0.1, 0.0)
+    
+    def test_norris_2d(self):
+        params = (1.0, -1.0, 0.1, 2.0)
+        y = norris(times.reshape(3, 1), *params)
+        np.testing.assert_allclose(y, norris(times, *params).reshape(3, 1))
+
+
+class TestNorrisBatch(TestCase):
+    def test_norris_batch(self):
+        params = [(1.0, -1.0, 0.1, 2.0), (2.0, 5.0, 0.5, 1.0)]
+        y = norris_batch(times, *np.array(params).T)
+        self.assertEqual(y.shape, (2, 3))
+        for i in range(2):
+            true = norris(times, *params[i])
+            [self.assertAlmostEqual(y[i,j], true[j]) for j in range(3)]
+    
+    def test_norris_batch_overflow(self):
+        params = (1.0, -1.0, 1e3, 1e-3)
+        with np.errstate(over='ignore', invalid='ignore'):
+            y = norris_batch(times, *[[param] for param in params])
+            true = norris(times, *params)
+        np.testing.assert_array_equal(y[0], true)
+    
+    def test_norris_batch_2d(self):
+        params = [(1.0, -1.0, 0.1, 2.0), (2.0, 5.0, 0.5, 1.0)]
+        x = np.stack((times, times + 1.0))
+        y = norris_batch(x, *np.array(params).T)
+        self.assertEqual(y.shape, (2, 2, 3))
+        for i in range(2):
+            np.testing.assert_allclose(y[i], norris(x, *params[i]))
 
 
 class TestConstant(TestCase):
@@ -52,6 +150,8 @@ class TestConstant(TestCase):
         params = (1.0,)
         y = constant(times, *params)
         self.assertCountEqual(y, np.array([1.0, 1.0, 1.0]))
+        self.assertFalse(y.flags.writeable)
+        self.assertEqual(constant(10.0, *params), 1.0)
 
 
 class TestLinear(TestCase):
@@ -60,6 +160,10 @@ class TestLinear(TestCase):
         y = linear(times, *params)
         self.assertCountEqual(y, np.array([21.0, 1.0, -19.0]))
     
+    def test_linear_int(self):
+        y = linear(np.arange(3), 1.5, 2)
+        np.testing.assert_array_equal(y, np.array([1.5, 3.5, 5.5]))
+    
 
 class TestQuadratic(TestCase):
     def test_quadratic(self):
@@ -67,6 +171,79 @@ class TestQuadratic(TestCase):
         y = quadratic(times, *params)
         self.assertCountEqual(y, np.array([221.0, 1.0, 181.0]))
     
+    def test_quadratic_int(self):
+        y = quadratic(np.arange(3), 1, 2, 3)
+        np.testing.assert_array_equal(y, np.array([1.0, 6.0, 17.0]))
+
+
+class TestEvaluateModel(TestCase):
+    def test_evaluate_model(self):
+        bkgd_params = (1.0, -2.0, 2.0)
+        pulse_params = [(1.0, -1.0, 0.1, 2.0), (2.0, 5.0, 0.5, 1.0)]
+        y = evaluate_model(times, bkgd_params, pulse_params)
+        true = quadratic(times, *bkgd_params) + \
+               norris(times, *pulse_params[0]) + norris(times, *pulse_params[1])
+        [self.assertAlmostEqual(y[i], true[i]) for i in range(3)]
+        
+        y = evaluate_model(times, bkgd_params, pulse_params, 
+                           assume_sorted=True)
+        np.testing.assert_allclose(y, true)
+        
+        y = evaluate_model(times[::-1], bkgd_params, pulse_params)
+        np.testing.assert_allclose(y, true[::-1])
+        
+        y = evaluate_model(times.reshape(3, 1), bkgd_params, pulse_params)
+        np.testing.assert_allclose(y, true.reshape(3, 1))
+        
+    def test_evaluate_model_overflow(self):
+        pulse_params = [(1.0, -1.0, 1e3, 1e-3)]
+        with np.errstate(over='ignore', invalid='ignore'):
+            y_sorted = evaluate_model(times, (0.0, 0.0, 0.0), pulse_params, 
+                                      assume_sorted=True)
+            y = evaluate_model(times, (0.0, 0.0, 0.0), pulse_params)
+            true = norris(times, *pulse_params[0])
+        np.testing.assert_array_equal(y_sorted, true)
+        np.testing.assert_array_equal(y, true)
+
+
+class TestOut(TestCase):
+    profiles = [(tophat, (1.0, 0.0, 20.0)), 
+                (norris, (1.0, -1.0, 0.1, 2.0)),
+                (constant, (1.0,)), 
+                (linear, (1.0, -2.0)), 
+                (quadratic, (1.0, -2.0, 2.0)),
+                (evaluate_model, ((1.0, -2.0, 2.0), [(1.0, -1.0, 0.1, 2.0)]))]
+    
+    def test_out(self):
+        for func, params in self.profiles:
+            out = np.full(times.size, np.nan)
+            y = func(times, *params, out=out)
+            self.assertIs(y, out)
+            np.testing.assert_allclose(y, func(times, *params))
+    
+    def test_out_assume_sorted(self):
+        out = np.full(times.size, np.nan)
+        y = tophat(times, 1.0, 0.0, 20.0, assume_sorted=True, out=out)
+        self.assertIs(y, out)
+        np.testing.assert_array_equal(y, np.array([0.0, 1.0, 1.0]))
+    
+    def test_out_alias(self):
+        for func, params in self.profiles:
+            x = times.copy()
+            y = func(x, *params, out=x)
+            self.assertIs(y, x)
+            np.testing.assert_allclose(y, func(times, *params))
+        
+        x = np.linspace(-1.0, 5.0, 7)
+        y = tophat(x, 1.0, 0.0, 2.0, out=x)
+        np.testing.assert_array_equal(y, np.array([0.0, 1.0, 1.0, 1.0, 
+                                                   0.0, 0.0, 0.0]))
+        
+        x = times.copy()
+        y = evaluate_model(x, *self.profiles[-1][1], assume_sorted=True, out=x)
+        np.testing.assert_allclose(y, evaluate_model(times, 
+                                                     *self.profiles[-1][1]))
+    
 
 if __name__ == '__main__':
     unittest.main()